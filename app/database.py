@@ -1,32 +1,116 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 import os
 
 # Get the absolute path to the database file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_PATH = os.path.join(BASE_DIR, "orders.db")
+DATABASE_PATH = os.getenv("DATABASE_PATH", os.path.join(BASE_DIR, "orders.db"))
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
 # Ensure the database directory has proper permissions
-if not os.path.exists(DATABASE_PATH):
+if DATABASE_PATH != ":memory:" and not os.path.exists(DATABASE_PATH):
     # Create an empty file with proper permissions
     open(DATABASE_PATH, "a").close()
     os.chmod(DATABASE_PATH, 0o666)
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "8"))
+
+# 연결마다 적용할 SQLite 튜닝 (fsync 완화, 캐시/mmap 확대)
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _apply_pragmas(dbapi_connection, pragmas):
+    if DATABASE_PATH == ":memory:":
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# 쓰기 전용 엔진: 커넥션 1개로 writer 를 직렬화해 SQLITE_BUSY 를 피한다
+write_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=0,
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 읽기 전용 엔진: WAL 스냅샷을 여러 커넥션에서 동시에 읽는다
+if DATABASE_PATH == ":memory:":
+    read_engine = write_engine
+else:
+    read_engine = create_engine(
+        f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=READ_POOL_SIZE,
+    )
+
+
+@event.listens_for(write_engine, "connect")
+def set_write_pragmas(dbapi_connection, connection_record):
+    # journal_mode 는 DB 파일에 저장되므로 writer 쪽에서만 설정
+    _apply_pragmas(dbapi_connection, ("PRAGMA journal_mode=WAL",) + SQLITE_PRAGMAS)
+
+
+if read_engine is not write_engine:
+
+    @event.listens_for(read_engine, "connect")
+    def set_read_pragmas(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, SQLITE_PRAGMAS)
+
+
+def optimize_database():
+    """Run PRAGMA optimize so SQLite refreshes its query planner statistics."""
+    if DATABASE_PATH == ":memory:":
+        return
+    with write_engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+
+
+# Create session classes
+WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Create Base class
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
+# 쓰기 세션이 커밋될 때마다 증가 (GET 응답 캐시 무효화용)
+_write_generation = 0
+
+
+@event.listens_for(WriteSessionLocal, "after_commit")
+def bump_write_generation(session):
+    global _write_generation
+    _write_generation += 1
+
+
+def get_write_generation():
+    return _write_generation
+
+
+def get_db_write():
+    db = WriteSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_db_read():
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
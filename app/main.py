@@ -1,26 +1,41 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert
 from . import models
-from .database import engine, get_db, Base
-from pydantic import BaseModel
+from .database import (
+    write_engine,
+    get_db_read,
+    get_db_write,
+    get_write_generation,
+    Base,
+    optimize_database,
+)
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import logging
+import time
+
+from sqlalchemy.orm import raiseload
 
-from sqlalchemy.orm import joinedload
-from datetime import datetime
-import io
+# pydantic 모델의 date 필드 이름과 겹치지 않도록 별칭으로 import
+from datetime import date as date_type, datetime
+import re
 from openpyxl import load_workbook
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS 설정
 origins = [
@@ -36,26 +51,132 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # preflight(OPTIONS) 응답을 브라우저가 하루 동안 캐시
 )
 
-# Create database tables
+# 1KB 이상인 응답(발주 목록 등)은 gzip 으로 압축
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# PRAGMA optimize 주기 (1시간)
+OPTIMIZE_INTERVAL_SECONDS = 60 * 60
+
+
+async def periodic_optimize():
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(optimize_database)
+        except Exception as e:
+            logger.error(f"Error running PRAGMA optimize: {e}")
+
+
+# 발주에 저장하는 거래처/품목/단위 이름 스냅샷 컬럼과 채울 때 쓰는 마스터 테이블
+ORDER_SNAPSHOT_COLUMNS = {
+    "supplier_name": ("suppliers", "supplier_id"),
+    "item_name": ("items", "item_id"),
+    "unit_name": ("units", "unit_id"),
+}
+
+
+def add_missing_order_snapshot_columns():
+    # 스냅샷 컬럼이 생기기 전의 orders.db 에 컬럼을 추가하고 기존 발주의 이름을 채움
+    with write_engine.begin() as connection:
+        existing = {
+            row[1] for row in connection.exec_driver_sql("PRAGMA table_info(orders)")
+        }
+        for column, (master_table, fk_column) in ORDER_SNAPSHOT_COLUMNS.items():
+            if column in existing:
+                continue
+            logger.info(f"Adding missing column orders.{column}")
+            connection.exec_driver_sql(
+                f"ALTER TABLE orders ADD COLUMN {column} VARCHAR"
+            )
+            connection.exec_driver_sql(
+                f"UPDATE orders SET {column} = "
+                f"(SELECT name FROM {master_table} WHERE id = orders.{fk_column})"
+            )
+
+
+def normalize_legacy_order_dates():
+    # 문자열로 저장되던 날짜(2024.01.05, 2024-1-7 등)를 Date 컬럼이 읽는 YYYY-MM-DD 로 변환
+    # 이미 YYYY-MM-DD 인 값은 건드리지 않으므로 정규화된 DB 에서는 바뀌는 행이 없음
+    with write_engine.begin() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT id, date FROM orders WHERE date IS NOT NULL"
+        ).fetchall()
+        updates = []
+        for order_id, value in rows:
+            value = str(value)
+            # 뒤에 시간이 붙은 값(2024-01-05 10:00:00)은 날짜 부분만 사용
+            match = _DATE_RE.match(value) or _DATE_RE.match(value[:10])
+            normalized = None
+            if match:
+                try:
+                    normalized = date_type(
+                        int(match[1]), int(match[2]), int(match[3])
+                    ).isoformat()
+                except ValueError:
+                    pass
+            if normalized == value:
+                continue
+            if normalized is None:
+                logger.warning(f"Clearing invalid date '{value}' of order {order_id}")
+            updates.append((normalized, order_id))
+        if updates:
+            logger.info(f"Normalizing {len(updates)} order dates")
+            connection.exec_driver_sql(
+                "UPDATE orders SET date = ? WHERE id = ?", updates
+            )
 
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Creating database tables...")
     try:
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=write_engine)
+        # create_all 은 이미 있는 테이블에 새로 추가된 컬럼/인덱스를 만들지 않음
+        add_missing_order_snapshot_columns()
+        normalize_legacy_order_dates()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=write_engine, checkfirst=True)
         logger.info("Database tables created successfully!")
     except Exception as e:
         logger.error(f"Error during startup: {e}")
         raise e
+    app.state.optimize_task = asyncio.create_task(periodic_optimize())
     logger.info("Database initialization completed!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.optimize_task.cancel()
+    try:
+        optimize_database()
+    except Exception as e:
+        logger.error(f"Error running PRAGMA optimize on shutdown: {e}")
+
+
 # Pydantic models
 
 
+# YYYY.MM.DD / YYYY-MM-DD / YYYY/MM/DD 형식의 날짜 문자열
+_DATE_RE = re.compile(r"^\s*(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})\s*$")
+
+
+def parse_date_input(value):
+    # 요청 본문의 날짜: 2024.01.05, 2024-1-5 처럼 기존에 받던 형식도 허용
+    if value == "":
+        return None
+    if isinstance(value, str):
+        match = _DATE_RE.match(value)
+        if match:
+            # 존재하지 않는 날짜(2024-13-45 등)는 ValueError -> 422
+            return date_type(int(match[1]), int(match[2]), int(match[3]))
+    # 그 밖의 값은 pydantic 의 기본 date 검증에 맡김
+    return value
+
+
 class SupplierBase(BaseModel):
     name: str
     contact: Optional[str] = None
@@ -114,12 +235,26 @@ class OrderBase(BaseModel):
     purchase_cycle: str    # 구입주기
     client: str
     notes: Optional[str] = None
-    date: Optional[str] = None
+    date: Optional[date_type] = None
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def parse_date(cls, value):
+        return parse_date_input(value)
+
+
+# 발주 응답에 포함되는 구입처/품목/단위 참조 (상세 정보는 각 마스터 API 에서 조회)
+class OrderMasterResponse(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
 
 
 class OrderResponse(BaseModel):
     id: int
-    date: Optional[str] = None
+    date: Optional[date_type] = None
     supplier_id: int
     item_id: int
     unit_id: int
@@ -130,9 +265,9 @@ class OrderResponse(BaseModel):
     purchase_cycle: str    # 구입주기
     client: str
     notes: Optional[str] = None
-    supplier: SupplierResponse
-    item: ItemResponse
-    unit: UnitResponse
+    supplier: OrderMasterResponse
+    item: OrderMasterResponse
+    unit: OrderMasterResponse
     approval_status: Optional[str] = None
     approved_by: Optional[str] = None
     approved_at: Optional[str] = None
@@ -153,7 +288,12 @@ class OrderCreate(BaseModel):
     purchase_cycle: str    # 구입주기
     client: str
     notes: Optional[str] = None
-    date: Optional[str] = None
+    date: Optional[date_type] = None
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def parse_date(cls, value):
+        return parse_date_input(value)
 
 
 class ApprovalRequest(BaseModel):
@@ -164,50 +304,128 @@ class RejectionRequest(BaseModel):
     reason: str
 
 
+class BulkApprovalRequest(ApprovalRequest):
+    ids: List[int]
+
+
+class BulkRejectionRequest(RejectionRequest):
+    ids: List[int]
+
+
+def parse_order_date(value):
+    if isinstance(value, datetime):  # Excel datetime 객체인 경우
+        return value.date()
+
+    match = _DATE_RE.match(str(value))
+    if match:
+        try:
+            return date_type(int(match[1]), int(match[2]), int(match[3]))
+        except ValueError as e:
+            logger.warning(f"Error parsing date '{value}': {e}")
+
+    logger.warning(f"Using current date for invalid date: '{value}'")
+    return datetime.now().date()
+
+
 def get_float_value(value):
-    if not value:
+    if value is None or value == "":
         return 0.0
+    # 엑셀 숫자 셀은 대부분 int/float 로 오므로 가장 먼저 처리
     if isinstance(value, (int, float)):
         return float(value)
-    if isinstance(value, str):
-        if value.startswith("="):  # 엑셀 수식인 경우
-            return 0.0  # 기본값 반환 또는 다른 처리 로직 추가
-        try:
-            return float(value.replace(",", ""))  # 천단위 구분자 제거
-        except ValueError:
-            return 0.0
-    return 0.0
+    raw = value if isinstance(value, str) else str(value)
+    if raw[:1] == "=":  # 엑셀 수식인 경우
+        return 0.0  # 기본값 반환 또는 다른 처리 로직 추가
+    try:
+        # 쉼표가 있을 때만 천단위 구분자를 제거해 불필요한 문자열 복사를 피함
+        return float(raw.replace(",", "") if "," in raw else raw)
+    except ValueError:
+        return 0.0
+
+
+# 이름으로 id 를 찾고 없으면 생성 (INSERT ... ON CONFLICT DO NOTHING RETURNING)
+# 이미 있는 이름이면 RETURNING 결과가 비어 있으므로 그때만 SELECT
+def get_or_create_master_id(db, model, name):
+    master_id = db.scalar(
+        insert(model)
+        .values(name=name)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(model.id)
+    )
+    if master_id is None:
+        master_id = db.scalar(select(model.id).where(model.name == name))
+    return master_id
+
+
+# 기존 이름 -> id 매핑을 한 번에 미리 읽어 두고, 처음 보는 이름만 한꺼번에 생성
+# rows_by_name: {이름: 새로 만들 때 사용할 나머지 컬럼 값}
+def _resolve_master_ids(db, model, rows_by_name):
+    if not rows_by_name:
+        return {}
+    ids = dict(db.query(model.name, model.id).all())
+
+    new_rows = [
+        {"name": name, **values}
+        for name, values in rows_by_name.items()
+        if name not in ids
+    ]
+    if new_rows:
+        db.execute(
+            insert(model).on_conflict_do_nothing(index_elements=["name"]),
+            new_rows,
+        )
+        new_names = [new_row["name"] for new_row in new_rows]
+        ids.update(
+            db.query(model.name, model.id).filter(model.name.in_(new_names)).all()
+        )
+    return ids
+
+
+# GET 목록 응답 캐시: {테이블명: (버전, 생성 시각, JSON bytes)}
+# 버전은 쓰기 세션 카운터 + 행 수/최대 id 로 만들고, 다른 프로세스의 쓰기는 TTL 로 반영
+RESPONSE_CACHE_TTL_SECONDS = 30
+_response_cache = {}
+
+
+def cached_json_response(db, model, load):
+    table = model.__tablename__
+    count, max_id = db.execute(text(f"SELECT COUNT(*), MAX(id) FROM {table}")).one()
+    version = (get_write_generation(), count, max_id)
+    now = time.monotonic()
+
+    cached = _response_cache.get(table)
+    if cached and cached[0] == version and now - cached[1] < RESPONSE_CACHE_TTL_SECONDS:
+        return Response(content=cached[2], media_type="application/json")
+
+    body = orjson.dumps(load())
+    _response_cache[table] = (version, now, body)
+    return Response(content=body, media_type="application/json")
 
 
 # API endpoints
 
 
 @app.post("/suppliers/", response_model=SupplierResponse)
-def create_supplier(supplier: SupplierBase, db: Session = Depends(get_db)):
+def create_supplier(supplier: SupplierBase, db: Session = Depends(get_db_write)):
     try:
-        # Check if supplier with same name already exists
-        existing_supplier = (
-            db.query(models.Supplier)
-            .filter(
-                models.Supplier.name == supplier.name,
-                # models.Supplier.is_deleted == False,
-                models.Supplier.is_deleted is False,
+        # 같은 이름이 이미 있으면 INSERT 가 무시되어 RETURNING 결과가 비어 있음
+        db_supplier = db.scalars(
+            insert(models.Supplier)
+            .values(
+                name=supplier.name,
+                contact=supplier.contact,
+                address=supplier.address,
+                is_deleted=False,
             )
-            .first()
-        )
-        if existing_supplier:
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(models.Supplier)
+        ).first()
+        if db_supplier is None:
             raise HTTPException(status_code=400, detail="already_exists")
 
-        db_supplier = models.Supplier(
-            name=supplier.name,
-            contact=supplier.contact,
-            address=supplier.address,
-            is_deleted=False,
-        )
-        db.add(db_supplier)
+        response = SupplierResponse.model_validate(db_supplier)
         db.commit()
-        db.refresh(db_supplier)
-        return db_supplier
+        return response
     except Exception as e:
         db.rollback()
         if isinstance(e, HTTPException):
@@ -219,18 +437,30 @@ def create_supplier(supplier: SupplierBase, db: Session = Depends(get_db)):
 
 
 @app.get("/suppliers/", response_model=List[SupplierResponse])
-def read_suppliers(db: Session = Depends(get_db)):
-    suppliers = db.query(models.Supplier).all()
-    return suppliers
+def read_suppliers(db: Session = Depends(get_db_read)):
+    return cached_json_response(
+        db,
+        models.Supplier,
+        lambda: [
+            SupplierResponse.model_validate(supplier).model_dump()
+            for supplier in db.query(models.Supplier).all()
+        ],
+    )
 
 
 @app.delete("/suppliers/bulk-delete")
-def bulk_delete_suppliers(supplier_ids: List[int], db: Session = Depends(get_db)):
+def bulk_delete_suppliers(supplier_ids: List[int], db: Session = Depends(get_db_write)):
     try:
         # 실제로 데이터를 삭제
         db.query(models.Supplier).filter(models.Supplier.id.in_(supplier_ids)).delete(
             synchronize_session=False
         )
+        # 발주의 이름 스냅샷을 비워 "삭제됨" 으로 표시되게 함
+        db.execute(
+            update(models.Order)
+            .where(models.Order.supplier_id.in_(supplier_ids))
+            .values(supplier_name=None)
+        )
         db.commit()
         return {"message": "Suppliers deleted successfully"}
     except Exception as e:
@@ -239,31 +469,26 @@ def bulk_delete_suppliers(supplier_ids: List[int], db: Session = Depends(get_db)
 
 
 @app.post("/items/", response_model=ItemResponse)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+def create_item(item: ItemCreate, db: Session = Depends(get_db_write)):
     try:
-        # Check if item with same name already exists
-        existing_item = (
-            db.query(models.Item)
-            .filter(
-                models.Item.name == item.name,
-                # models.Item.is_deleted == False,
-                models.Item.is_deleted is False,
+        # 같은 이름이 이미 있으면 INSERT 가 무시되어 RETURNING 결과가 비어 있음
+        db_item = db.scalars(
+            insert(models.Item)
+            .values(
+                name=item.name,
+                description=item.description,
+                price=item.price,
+                is_deleted=False,
             )
-            .first()
-        )
-        if existing_item:
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(models.Item)
+        ).first()
+        if db_item is None:
             raise HTTPException(status_code=400, detail="already_exists")
 
-        db_item = models.Item(
-            name=item.name,
-            description=item.description,
-            price=item.price,
-            is_deleted=False,
-        )
-        db.add(db_item)
+        response = ItemResponse.model_validate(db_item)
         db.commit()
-        db.refresh(db_item)
-        return db_item
+        return response
     except Exception as e:
         db.rollback()
         if isinstance(e, HTTPException):
@@ -275,17 +500,29 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/items/", response_model=List[ItemResponse])
-def read_items(db: Session = Depends(get_db)):
-    items = db.query(models.Item).all()
-    return items
+def read_items(db: Session = Depends(get_db_read)):
+    return cached_json_response(
+        db,
+        models.Item,
+        lambda: [
+            ItemResponse.model_validate(item).model_dump()
+            for item in db.query(models.Item).all()
+        ],
+    )
 
 
 @app.delete("/items/bulk-delete")
-def bulk_delete_items(item_ids: List[int], db: Session = Depends(get_db)):
+def bulk_delete_items(item_ids: List[int], db: Session = Depends(get_db_write)):
     try:
         db.query(models.Item).filter(models.Item.id.in_(item_ids)).delete(
             synchronize_session=False
         )
+        # 발주의 이름 스냅샷을 비워 "삭제됨" 으로 표시되게 함
+        db.execute(
+            update(models.Order)
+            .where(models.Order.item_id.in_(item_ids))
+            .values(item_name=None)
+        )
         db.commit()
         return {"message": "Items deleted successfully"}
     except Exception as e:
@@ -294,30 +531,25 @@ def bulk_delete_items(item_ids: List[int], db: Session = Depends(get_db)):
 
 
 @app.post("/units/", response_model=UnitResponse)
-def create_unit(unit: UnitCreate, db: Session = Depends(get_db)):
+def create_unit(unit: UnitCreate, db: Session = Depends(get_db_write)):
     try:
-        # Check if unit with same name already exists
-        existing_unit = (
-            db.query(models.Unit)
-            .filter(
-                models.Unit.name == unit.name,
-                # models.Unit.is_deleted == False,
-                models.Unit.is_deleted is False,
+        # 같은 이름이 이미 있으면 INSERT 가 무시되어 RETURNING 결과가 비어 있음
+        db_unit = db.scalars(
+            insert(models.Unit)
+            .values(
+                name=unit.name,
+                description=unit.description or "",
+                is_deleted=False,
             )
-            .first()
-        )
-        if existing_unit:
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(models.Unit)
+        ).first()
+        if db_unit is None:
             raise HTTPException(status_code=400, detail="already_exists")
 
-        db_unit = models.Unit(
-            name=unit.name,
-            description=unit.description,
-            is_deleted=False,
-        )
-        db.add(db_unit)
+        response = UnitResponse.model_validate(db_unit)
         db.commit()
-        db.refresh(db_unit)
-        return db_unit
+        return response
     except Exception as e:
         db.rollback()
         if isinstance(e, HTTPException):
@@ -329,17 +561,29 @@ def create_unit(unit: UnitCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/units/", response_model=List[UnitResponse])
-def read_units(db: Session = Depends(get_db)):
-    units = db.query(models.Unit).all()
-    return units
+def read_units(db: Session = Depends(get_db_read)):
+    return cached_json_response(
+        db,
+        models.Unit,
+        lambda: [
+            UnitResponse.model_validate(unit).model_dump()
+            for unit in db.query(models.Unit).all()
+        ],
+    )
 
 
 @app.delete("/units/bulk-delete")
-def bulk_delete_units(unit_ids: List[int], db: Session = Depends(get_db)):
+def bulk_delete_units(unit_ids: List[int], db: Session = Depends(get_db_write)):
     try:
         db.query(models.Unit).filter(models.Unit.id.in_(unit_ids)).delete(
             synchronize_session=False
         )
+        # 발주의 이름 스냅샷을 비워 "삭제됨" 으로 표시되게 함
+        db.execute(
+            update(models.Order)
+            .where(models.Order.unit_id.in_(unit_ids))
+            .values(unit_name=None)
+        )
         db.commit()
         return {"message": "Units deleted successfully"}
     except Exception as e:
@@ -347,42 +591,60 @@ def bulk_delete_units(unit_ids: List[int], db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _master_snapshot(master_id, name):
+    # 스냅샷이 없는 경우(존재하지 않는 id 로 생성된 발주 등)는 삭제된 것으로 표시
+    if name is None:
+        return {"id": 0, "name": "삭제됨"}
+    return {"id": master_id, "name": name}
+
+
+def load_orders(db):
+    orders = (
+        db.query(models.Order)
+        .filter(models.Order.is_deleted.is_(False))
+        # 관계는 사용하지 않으므로 지연 로딩(N+1) 대신 에러를 발생시킴
+        .options(raiseload("*"))
+        .all()
+    )
+
+    # 구입처/품목/단위는 발주에 저장된 이름 스냅샷으로 응답 (조인 없음)
+    columns = [column.key for column in models.Order.__table__.columns]
+    payload = []
+    for order in orders:
+        data = {key: getattr(order, key) for key in columns}
+        data["supplier"] = _master_snapshot(order.supplier_id, order.supplier_name)
+        data["item"] = _master_snapshot(order.item_id, order.item_name)
+        data["unit"] = _master_snapshot(order.unit_id, order.unit_name)
+        payload.append(OrderResponse.model_validate(data).model_dump())
+    return payload
+
+
 @app.get("/orders/", response_model=List[OrderResponse])
-def read_orders(db: Session = Depends(get_db)):
+def read_orders(db: Session = Depends(get_db_read)):
     try:
-        orders = (
-            db.query(models.Order)
-            .filter(models.Order.is_deleted.is_(False))
-            .options(
-                joinedload(models.Order.supplier),
-                joinedload(models.Order.item),
-                joinedload(models.Order.unit),
-            )
-            .all()
-        )
-
-        # 삭제된 데이터에 대한 처리
-        for order in orders:
-            if not order.supplier or order.supplier.is_deleted:
-                order.supplier = models.Supplier(id=0, name="삭제됨")
-            if not order.item or order.item.is_deleted:
-                order.item = models.Item(id=0, name="삭제됨")
-            if not order.unit or order.unit.is_deleted:
-                order.unit = models.Unit(id=0, name="삭제됨")
-
-        return orders
+        return cached_json_response(db, models.Order, lambda: load_orders(db))
     except Exception as e:
         logger.error(f"Error reading orders: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/orders/", response_model=OrderResponse)
-def create_order(order: OrderBase, db: Session = Depends(get_db)):
+def create_order(order: OrderBase, db: Session = Depends(get_db_write)):
     try:
         db_order = models.Order(
             supplier_id=order.supplier_id,
             item_id=order.item_id,
             unit_id=order.unit_id,
+            # 이름 스냅샷은 INSERT 안의 서브쿼리로 채움
+            supplier_name=select(models.Supplier.name)
+            .where(models.Supplier.id == order.supplier_id)
+            .scalar_subquery(),
+            item_name=select(models.Item.name)
+            .where(models.Item.id == order.item_id)
+            .scalar_subquery(),
+            unit_name=select(models.Unit.name)
+            .where(models.Unit.id == order.unit_id)
+            .scalar_subquery(),
             quantity=order.quantity,
             price=order.price,
             total=order.total,
@@ -403,62 +665,52 @@ def create_order(order: OrderBase, db: Session = Depends(get_db)):
 
 
 @app.put("/orders/{order_id}")
-def update_order(order_id: int, order: OrderCreate, db: Session = Depends(get_db)):
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if not db_order:
+def update_order(
+    order_id: int, order: OrderCreate, db: Session = Depends(get_db_write)
+):
+    # 구입처/품목/단위 찾기 또는 생성
+    supplier_id = get_or_create_master_id(db, models.Supplier, order.supplier_name)
+    item_id = get_or_create_master_id(db, models.Item, order.item_name)
+    unit_id = get_or_create_master_id(db, models.Unit, order.unit_name)
+
+    # 발주 데이터 업데이트 (UPDATE ... RETURNING 한 번으로 처리)
+    db_order = db.scalars(
+        update(models.Order)
+        .where(models.Order.id == order_id)
+        .values(
+            quantity=order.quantity,
+            price=order.price,
+            total=order.total,
+            payment_schedule=order.payment_schedule,  # 대금지급주기
+            purchase_cycle=order.purchase_cycle,      # 구입주기
+            client=order.client,
+            notes=order.notes,
+            date=order.date,
+            supplier_id=supplier_id,
+            item_id=item_id,
+            unit_id=unit_id,
+            supplier_name=order.supplier_name,
+            item_name=order.item_name,
+            unit_name=order.unit_name,
+        )
+        .returning(models.Order)
+    ).first()
+    if db_order is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Order not found")
 
-    # 구입처 찾기 또는 생성
-    supplier = (
-        db.query(models.Supplier)
-        .filter(models.Supplier.name == order.supplier_name)
-        .first()
-    )
-    if not supplier:
-        supplier = models.Supplier(name=order.supplier_name)
-        db.add(supplier)
-        db.flush()
-
-    # 품목 찾기 또는 생성
-    item = db.query(models.Item).filter(models.Item.name == order.item_name).first()
-    if not item:
-        item = models.Item(name=order.item_name)
-        db.add(item)
-        db.flush()
-
-    # 단위 찾기 또는 생성
-    unit = db.query(models.Unit).filter(models.Unit.name == order.unit_name).first()
-    if not unit:
-        unit = models.Unit(name=order.unit_name)
-        db.add(unit)
-        db.flush()
-
-    # 발주 데이터 업데이트
-    db_order.quantity = order.quantity
-    db_order.price = order.price
-    db_order.total = order.total
-    db_order.payment_schedule = order.payment_schedule  # 대금지급주기
-    db_order.purchase_cycle = order.purchase_cycle      # 구입주기
-    db_order.client = order.client
-    db_order.notes = order.notes
-    db_order.date = order.date
-
-    db_order.supplier_id = supplier.id
-    db_order.item_id = item.id
-    db_order.unit_id = unit.id
-
+    # 커밋하면 속성이 만료되므로 응답을 먼저 만들어 둠
+    response = jsonable_encoder(db_order)
     db.commit()
-    db.refresh(db_order)
-    return db_order
+    return response
 
 
 @app.delete("/orders/bulk-delete")
-def delete_orders(ids: List[int], db: Session = Depends(get_db)):
+def delete_orders(ids: List[int], db: Session = Depends(get_db_write)):
     try:
-        for order_id in ids:
-            order = db.query(models.Order).filter(models.Order.id == order_id).first()
-            if order:
-                db.delete(order)
+        db.query(models.Order).filter(models.Order.id.in_(ids)).delete(
+            synchronize_session=False
+        )
         db.commit()
         return {"message": "Orders deleted successfully"}
     except Exception as e:
@@ -466,109 +718,93 @@ def delete_orders(ids: List[int], db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/orders/upload")
-async def upload_orders(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    if not file.filename.endswith(".xlsx"):
-        raise HTTPException(status_code=400, detail="Only .xlsx files are allowed")
+# 엑셀 파일을 읽어 발주 데이터와 새로 만들 구입처/품목/단위 값을 모음 (DB 접근 없음)
+def read_order_workbook(fileobj):
+    # data_only=True로 수식 대신 값을 가져오고,
+    # read_only=True로 전체 셀 객체를 만들지 않고 행 단위로 스트리밍
+    wb = load_workbook(filename=fileobj, data_only=True, read_only=True)
+    ws = wb.active
 
+    orders = []
+    supplier_rows = {}
+    item_rows = {}
+    unit_rows = {}
     try:
-        contents = await file.read()
-        wb = load_workbook(
-            filename=io.BytesIO(contents), data_only=True
-        )  # data_only=True로 수식 대신 값을 가져옴
-        ws = wb.active
-
-        orders = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
+        # 시트 크기 정보가 없는 파일도 항상 11개 열로 맞춰서 읽음
+        for row in ws.iter_rows(min_row=2, max_col=11, values_only=True):
             if not any(row):  # 빈 행 건너뛰기
                 continue
 
-            try:
-                date_str = str(row[0])
-                order_date = None
-
-                if isinstance(row[0], datetime):  # Excel datetime 객체인 경우
-                    order_date = row[0].date()
-                elif "." in date_str:
-                    try:
-                        # 날짜 문자열에서 공백 제거 및 분리
-                        parts = date_str.strip().split(".")
-                        if len(parts) == 3:
-                            year = int(parts[0])
-                            month = int(parts[1])
-                            day = int(parts[2])
-                            order_date = datetime(year, month, day).date()
-                    except (ValueError, TypeError, IndexError) as e:
-                        print(f"Error parsing date with parts '{date_str}': {str(e)}")
-
-                if order_date is None:
-                    # 다른 형식들 시도
-                    date_formats = ["%Y.%m.%d", "%Y-%m-%d", "%Y/%m/%d"]
-                    for date_format in date_formats:
-                        try:
-                            order_date = datetime.strptime(
-                                date_str.strip(), date_format
-                            ).date()
-                            break
-                        except ValueError:
-                            continue
-
-                if order_date is None:
-                    print(f"Using current date for invalid date: '{date_str}'")
-                    order_date = datetime.now().date()
-
-            except Exception as e:
-                print(f"Error processing date '{str(row[0])}': {str(e)}")
-                order_date = datetime.now().date()
-
-            # 구입처 찾기 또는 생성
-            supplier = (
-                db.query(models.Supplier).filter(models.Supplier.name == row[1]).first()
-            )
-            if not supplier:
-                supplier = models.Supplier(name=row[1], contact=row[9])
-                db.add(supplier)
-                db.flush()
-
-            # 품목 찾기 또는 생성
-            item = db.query(models.Item).filter(models.Item.name == row[2]).first()
-            if not item:
-                notes = str(row[10] or "")
-                vat_excluded = "부가세별도" in notes
-                item = models.Item(
-                    name=row[2],
-                    price=get_float_value(row[3]),
-                    vat_excluded=vat_excluded,
-                    description="부가세별도" if vat_excluded else None,
-                )
-                db.add(item)
-                db.flush()
-
-            # 단위 찾기 또는 생성
+            # 이름이 비어 있으면 빈 문자열로 저장 (NULL 은 ON CONFLICT 로 중복 판별 불가)
+            supplier_name = "" if row[1] is None else str(row[1])
+            item_name = "" if row[2] is None else str(row[2])
             unit_name = str(row[4] or "개")  # None이면 기본값 "개" 사용
-            unit = db.query(models.Unit).filter(models.Unit.name == unit_name).first()
-            if not unit:
-                unit = models.Unit(name=unit_name)
-                db.add(unit)
-                db.flush()
-
-            # 발주 데이터 생성
-            order = models.Order(
-                date=order_date,
-                supplier_id=supplier.id,
-                item_id=item.id,
-                unit_id=unit.id,
-                price=get_float_value(row[3]),
-                quantity=get_float_value(row[5]),
-                total=get_float_value(row[6]),
-                payment_schedule=str(row[7] or "미정"),
-                purchase_cycle=str(row[8] or "daily"),
-                client=str(row[9] or ""),
-                notes=str(row[10] or ""),
+
+            # 행마다 한 번만 변환해서 품목 생성과 발주 데이터에 같이 사용
+            notes = str(row[10] or "")
+            price = get_float_value(row[3])
+
+            # 새로 만들 구입처/품목/단위는 처음 나온 행의 값으로 생성
+            if supplier_name not in supplier_rows:
+                supplier_rows[supplier_name] = {"contact": row[9]}
+            if item_name not in item_rows:
+                vat_excluded = "부가세별도" in notes
+                item_rows[item_name] = {
+                    "price": price,
+                    "vat_excluded": vat_excluded,
+                    "description": "부가세별도" if vat_excluded else None,
+                }
+            unit_rows.setdefault(unit_name, {})
+
+            # 발주 데이터 (구입처/품목/단위 id 는 저장할 때 채움)
+            orders.append(
+                {
+                    "date": parse_order_date(row[0]),
+                    "supplier_name": supplier_name,
+                    "item_name": item_name,
+                    "unit_name": unit_name,
+                    "price": price,
+                    "quantity": get_float_value(row[5]),
+                    "total": get_float_value(row[6]),
+                    "payment_schedule": str(row[7] or "미정"),
+                    "purchase_cycle": str(row[8] or "daily"),
+                    "client": str(row[9] or ""),
+                    "notes": notes,
+                }
             )
-            orders.append(order)
+    finally:
+        # read-only 모드는 닫을 때까지 워크시트 XML 파트를 열어 둠
+        wb.close()
+
+    return orders, supplier_rows, item_rows, unit_rows
+
+
+# 엑셀 파싱과 DB 저장 모두 블로킹 작업이므로 async 가 아닌 일반 함수로 선언해
+# FastAPI 가 스레드풀에서 실행하도록 함 (이벤트 루프를 막지 않음)
+@app.post("/orders/upload")
+def upload_orders(file: UploadFile = File(...), db: Session = Depends(get_db_write)):
+    if not file.filename.endswith(".xlsx"):
+        raise HTTPException(status_code=400, detail="Only .xlsx files are allowed")
+
+    try:
+        # 업로드 파일은 이미 SpooledTemporaryFile(1MB 초과 시 디스크)에 담겨 있으므로
+        # 메모리로 전부 읽어 들이지 않고 그대로 openpyxl 에 넘김
+        file.file.seek(0)
+        orders, supplier_rows, item_rows, unit_rows = read_order_workbook(file.file)
 
-        db.add_all(orders)
+        # 구입처/품목/단위를 테이블당 한 번에 조회하고 없는 것만 생성
+        supplier_ids = _resolve_master_ids(db, models.Supplier, supplier_rows)
+        item_ids = _resolve_master_ids(db, models.Item, item_rows)
+        unit_ids = _resolve_master_ids(db, models.Unit, unit_rows)
+
+        # 발주 데이터에 id 를 채우고 ORM 객체 없이 executemany 로 INSERT
+        for order in orders:
+            order["supplier_id"] = supplier_ids[order["supplier_name"]]
+            order["item_id"] = item_ids[order["item_name"]]
+            order["unit_id"] = unit_ids[order["unit_name"]]
+
+        if orders:
+            db.execute(insert(models.Order), orders)
         db.commit()
 
         return {"message": f"Successfully uploaded {len(orders)} orders"}
@@ -580,50 +816,62 @@ async def upload_orders(file: UploadFile = File(...), db: Session = Depends(get_
 
 @app.put("/suppliers/{supplier_id}", response_model=SupplierResponse)
 def update_supplier(
-    supplier_id: int, supplier: SupplierBase, db: Session = Depends(get_db)
+    supplier_id: int, supplier: SupplierBase, db: Session = Depends(get_db_write)
 ):
-    db_supplier = (
-        db.query(models.Supplier).filter(models.Supplier.id == supplier_id).first()
-    )
-    if not db_supplier:
+    db_supplier = db.scalars(
+        update(models.Supplier)
+        .where(models.Supplier.id == supplier_id)
+        .values(**supplier.dict())
+        .returning(models.Supplier)
+    ).first()
+    if db_supplier is None:
         raise HTTPException(status_code=404, detail="Supplier not found")
 
-    for key, value in supplier.dict().items():
-        setattr(db_supplier, key, value)
+    # 발주에 저장된 이름 스냅샷도 함께 갱신
+    db.execute(
+        update(models.Order)
+        .where(models.Order.supplier_id == supplier_id)
+        .values(supplier_name=supplier.name)
+    )
 
+    response = SupplierResponse.model_validate(db_supplier)
     db.commit()
-    db.refresh(db_supplier)
-    return db_supplier
+    return response
 
 
 @app.put("/items/{item_id}", response_model=ItemResponse)
-def update_item(item_id: int, item: ItemBase, db: Session = Depends(get_db)):
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if not db_item:
+def update_item(item_id: int, item: ItemBase, db: Session = Depends(get_db_write)):
+    db_item = db.scalars(
+        update(models.Item)
+        .where(models.Item.id == item_id)
+        .values(**item.dict())
+        .returning(models.Item)
+    ).first()
+    if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    for key, value in item.dict().items():
-        setattr(db_item, key, value)
+    # 발주에 저장된 이름 스냅샷도 함께 갱신
+    db.execute(
+        update(models.Order)
+        .where(models.Order.item_id == item_id)
+        .values(item_name=item.name)
+    )
 
+    response = ItemResponse.model_validate(db_item)
     db.commit()
-    db.refresh(db_item)
-    return db_item
+    return response
 
 
 @app.put("/units/{unit_id}", response_model=UnitResponse)
-def update_unit(unit_id: int, unit: UnitCreate, db: Session = Depends(get_db)):
+def update_unit(unit_id: int, unit: UnitCreate, db: Session = Depends(get_db_write)):
     try:
-        db_unit = db.query(models.Unit).filter(models.Unit.id == unit_id).first()
-        if not db_unit:
-            raise HTTPException(status_code=404, detail="Unit not found")
-
         # Check if another unit with the same name exists
         existing_unit = (
             db.query(models.Unit)
             .filter(
                 models.Unit.name == unit.name,
                 models.Unit.id != unit_id,
-                models.Unit.is_deleted is False,
+                models.Unit.is_deleted.is_(False),
             )
             .first()
         )
@@ -635,12 +883,25 @@ def update_unit(unit_id: int, unit: UnitCreate, db: Session = Depends(get_db)):
         if unit_data.get("description") is None:
             unit_data["description"] = ""
 
-        for key, value in unit_data.items():
-            setattr(db_unit, key, value)
+        db_unit = db.scalars(
+            update(models.Unit)
+            .where(models.Unit.id == unit_id)
+            .values(**unit_data)
+            .returning(models.Unit)
+        ).first()
+        if db_unit is None:
+            raise HTTPException(status_code=404, detail="Unit not found")
 
+        # 발주에 저장된 이름 스냅샷도 함께 갱신
+        db.execute(
+            update(models.Order)
+            .where(models.Order.unit_id == unit_id)
+            .values(unit_name=unit.name)
+        )
+
+        response = UnitResponse.model_validate(db_unit)
         db.commit()
-        db.refresh(db_unit)
-        return db_unit
+        return response
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -649,36 +910,77 @@ def update_unit(unit_id: int, unit: UnitCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _now_str():
+    return datetime.now().strftime("%y-%m-%d %H:%M")
+
+
 @app.post("/orders/{order_id}/approve")
 def approve_order(
-    order_id: int, approval: ApprovalRequest, db: Session = Depends(get_db)
+    order_id: int, approval: ApprovalRequest, db: Session = Depends(get_db_write)
 ):
     if approval.password != "admin":
         raise HTTPException(status_code=401, detail="Invalid password")
 
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if not order:
+    result = db.execute(
+        update(models.Order)
+        .where(models.Order.id == order_id)
+        .values(approval_status="approved", approved_by="이지은", approved_at=_now_str())
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    order.approval_status = "approved"
-    order.approved_by = "이지은"
-    order.approved_at = datetime.now().strftime("%y-%m-%d %H:%M")
-
     db.commit()
     return {"message": "Order approved successfully"}
 
 
 @app.post("/orders/{order_id}/reject")
 def reject_order(
-    order_id: int, rejection: RejectionRequest, db: Session = Depends(get_db)
+    order_id: int, rejection: RejectionRequest, db: Session = Depends(get_db_write)
 ):
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if not order:
+    result = db.execute(
+        update(models.Order)
+        .where(models.Order.id == order_id)
+        .values(
+            approval_status="rejected",
+            rejection_reason=rejection.reason,
+            approved_at=_now_str(),
+        )
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    order.approval_status = "rejected"
-    order.rejection_reason = rejection.reason
-    order.approved_at = datetime.now().strftime("%y-%m-%d %H:%M")
-
     db.commit()
     return {"message": "Order rejected successfully"}
+
+
+@app.post("/orders/bulk-approve")
+def bulk_approve_orders(
+    approval: BulkApprovalRequest, db: Session = Depends(get_db_write)
+):
+    if approval.password != "admin":
+        raise HTTPException(status_code=401, detail="Invalid password")
+
+    db.execute(
+        update(models.Order)
+        .where(models.Order.id.in_(approval.ids))
+        .values(approval_status="approved", approved_by="이지은", approved_at=_now_str())
+    )
+    db.commit()
+    return {"message": "Orders approved successfully"}
+
+
+@app.post("/orders/bulk-reject")
+def bulk_reject_orders(
+    rejection: BulkRejectionRequest, db: Session = Depends(get_db_write)
+):
+    db.execute(
+        update(models.Order)
+        .where(models.Order.id.in_(rejection.ids))
+        .values(
+            approval_status="rejected",
+            rejection_reason=rejection.reason,
+            approved_at=_now_str(),
+        )
+    )
+    db.commit()
+    return {"message": "Orders rejected successfully"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -52,9 +52,13 @@ class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True)
-    supplier_id = Column(Integer, ForeignKey("suppliers.id"))
-    item_id = Column(Integer, ForeignKey("items.id"))
-    unit_id = Column(Integer, ForeignKey("units.id"))
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), index=True)
+    unit_id = Column(Integer, ForeignKey("units.id"), index=True)
+    # 목록 조회 시 조인을 피하기 위한 구입처/품목/단위 이름 스냅샷
+    supplier_name = Column(String, nullable=True)
+    item_name = Column(String, nullable=True)
+    unit_name = Column(String, nullable=True)
     quantity = Column(Float)
     price = Column(Float)
     total = Column(Float)
@@ -62,7 +66,7 @@ class Order(Base):
     purchase_cycle = Column(String, default="daily")  # 구입주기
     client = Column(String, nullable=True)  # 구입 연락처를 nullable로 변경
     notes = Column(String, nullable=True)
-    date = Column(String, nullable=True)
+    date = Column(Date, nullable=True, index=True)
     is_deleted = Column(Boolean, default=False)  # is_deleted 필드 추가
 
     # 승인 관련 필드 추가
@@ -79,3 +83,7 @@ class Order(Base):
         return (
             f"<Order(id={self.id}, date='{self.date}', supplier_id={self.supplier_id})>"
         )
+
+
+# 삭제되지 않은 발주만 담는 부분 인덱스 (read_orders 의 is_deleted IS 0 조건과 동일)
+Index("ix_orders_active", Order.id, sqlite_where=Order.is_deleted.is_(False))